@@ -6,8 +6,8 @@ filename_output.txt
 
 This programs accepts '.csv' and '.txt' files
 
-The depends on the 'anytree' package and thus, requires user to install the anytree 
-module in the user python environments 
+The program depends on the 'numpy' package and thus, requires user to install the numpy
+module in the user python environments
 
 The program can only be executed in command line. The program can be executed as follows:
 To write only the only the optimal route
@@ -23,9 +23,70 @@ and the interpretor can specified. For instance, $ python3 airlineRoutes.py file
 
 
 # Dependencies
-import csv, sys, argparse, math, ntpath
-from anytree import Node
+import csv, sys, argparse, ntpath
+from pathlib import Path
 from random import randint
+from collections import defaultdict
+from operator import itemgetter
+import numpy as np
+
+# Indices over the CSV files, built once by _load_indices()
+AIRPORTS_BY_CITY = defaultdict(list)
+AIRPORTS_BY_CODE = {}
+ROUTES_OUT = defaultdict(set)
+ROUTES_IN = defaultdict(set)
+ROUTE_DETAILS = defaultdict(list)
+AIRLINES_BY_ID = {}
+
+# The maximum number of flights of a supported route
+MAX_HOPS = 5
+
+
+def _load_indices():
+
+    """ Reads airports.csv, routes.csv and airlines.csv once and builds the lookup indices
+
+    Each file is parsed in a single pass that fills all of its indices at the same time.
+
+    AIRPORTS_BY_CITY maps (city, country) to the IATA codes of its airports,
+    AIRPORTS_BY_CODE maps an IATA code to its (latitude, longitude),
+    ROUTES_OUT and ROUTES_IN map an IATA code to the set of cities reachable from/to it,
+    ROUTE_DETAILS maps (start, stop) to the list of (airline id, stops) of the route and
+    AIRLINES_BY_ID maps the id of an active airline to its IATA code, or its ICAO code
+    when it has no IATA code. Airlines without either code are left out
+
+    """
+
+    with open('CSVFiles/airports.csv') as airports_csv:
+        airports = csv.reader(airports_csv, delimiter=',')
+        get_airport = itemgetter(2, 3, 4, 6, 7)
+        for city, country, code, latitude, longitude in map(get_airport, airports):
+            if code != "\\N":
+                AIRPORTS_BY_CITY[(city, country)].append(code)
+            AIRPORTS_BY_CODE.setdefault(code, (float(latitude), float(longitude)))
+
+    with open('CSVFiles/routes.csv') as routes_csv:
+        routes = csv.reader(routes_csv, delimiter=',')
+        get_route = itemgetter(1, 2, 4, 7)
+        for airline_id, start, stop, stops in map(get_route, routes):
+            # The codes are set members and dict keys all through the search
+            start = sys.intern(start)
+            stop = sys.intern(stop)
+            ROUTES_OUT[start].add(stop)
+            ROUTES_IN[stop].add(start)
+            if airline_id != "\\N":
+                ROUTE_DETAILS[(start, stop)].append((int(airline_id), int(stops)))
+
+    with open('CSVFiles/airlines.csv') as airlines_csv:
+        airlines = csv.reader(airlines_csv, delimiter=',')
+        get_airline = itemgetter(0, 3, 4, 7)
+        for airline_id, iata, icao, active in map(get_airline, airlines):
+            if active == "Y":
+                if len(iata) != 0 and iata != "\\N":
+                    AIRLINES_BY_ID[int(airline_id)] = iata
+                elif len(icao) != 0 and icao != "\\N":
+                    AIRLINES_BY_ID[int(airline_id)] = icao
+
 
 def read_file(file_name):
 
@@ -91,11 +152,11 @@ def execute_argument():
     parser.add_argument('file_data', metavar='filename.txt', type=read_file, nargs="+" ,
                         help='File or path containing the start city and the destination city')
     parser.add_argument('--all', dest = "show", action='store_const', const= "ALL",help='Print all possible routes and an optimal route')
-               
-    return  (parser.parse_args().file_data[0], parser.parse_args().show)
+    arguments = parser.parse_args()
+    return (arguments.file_data[0], arguments.show)
 
 
-def find_location_code(location, country, file_name):
+def find_location_code(location, country, output_lines):
 
     """ Finds and check if the country IATA code exits in airpots.csv
 
@@ -105,8 +166,8 @@ def find_location_code(location, country, file_name):
         the city to search
     country: str
         the country the city is located 
-    file_name: str
-        the file name of the file containing the route details
+    output_lines: list
+        the lines written to the output file at the end of the program
 
     Returns
     -------
@@ -115,20 +176,11 @@ def find_location_code(location, country, file_name):
 
     """
 
-    all_codes = []
-    file = open("OutputFiles/" + file_name + "_output.txt", "a")
-    with open('CSVFiles/airports.csv') as airports_csv:
-        airports = csv.reader(airports_csv, delimiter=',')
-        for airport in airports:
-            if airport[2] == location and airport[3] == country:
-                 all_codes.append(airport[4])
-                                    
-    for city_code in all_codes:
-        if city_code != "\\N":
-            return city_code
+    all_codes = AIRPORTS_BY_CITY.get((location, country))
+    if all_codes:
+        return all_codes[0]
     else:
-        file.write("Unsupported request!\n")
-        file.close()
+        output_lines.append("Unsupported request!\n")
         sys.exit(2)
 
 
@@ -145,14 +197,7 @@ def find_possible_destinations(iata_code):
     set
         set of the IATA code of all the possibles cities.
     """
-    all_possible_destination = []
-    with open('CSVFiles/routes.csv') as routes_csv:
-        routes = csv.reader(routes_csv, delimiter=',')
-        for route in routes:
-            if route[2] == iata_code:
-                all_possible_destination.append(route[4])
-
-    return set(all_possible_destination)
+    return ROUTES_OUT.get(iata_code, set())
 
 
 def find_possible_starts(iata_code):
@@ -169,36 +214,25 @@ def find_possible_starts(iata_code):
         the set of the IATA code of all the possible start cities
     """
 
-    all_possible_start = []
-    with open('CSVFiles/routes.csv') as routes_csv:
-        routes = csv.reader(routes_csv, delimiter=',')
-        for route in routes:
-            if route[4] == iata_code:
-                all_possible_start.append(route[2])
-
-    return set(all_possible_start)
+    return ROUTES_IN.get(iata_code, set())
 
 
-def find_routes(start,stop,start_list, destination_list, start_node, stop_node, file_name):
+def find_routes(start, stop, output_lines):
 
     """ Find all the shortest possible routes from a location to a destination base on the number of flight
 
+    The search is a bidirectional breadth first search: each round expands the smaller of the
+    two frontiers by one flight and stops at the first round where the two frontiers meet.
+    Routes that need more than MAX_HOPS flights are reported as unsupported.
+
     Parameters
     ----------
     start: str 
         the IATA code of the start city
     stop: str 
         the IATA code of the destination city
-    start_list: list
-        all the possible destinations from the start city
-    destination_list: list
-        all the possible starts to the stop/destination city
-    start_node: Node
-        the node/tree of the start city
-    stop_node: Node
-        the node/tree of the destination city
-    file_name: str
-        the file name of the file containing the route details
+    output_lines: list
+        the lines written to the output file at the end of the program
 
     Returns
     -------
@@ -207,70 +241,62 @@ def find_routes(start,stop,start_list, destination_list, start_node, stop_node,
 
     """
 
-    matched_path = []
-    temp_route = []
-    file = open("OutputFiles/" + file_name + "_output.txt", "a")
-    if stop in start_list:
-        temp_route.append([start,stop])
-        return temp_route
-    else:
-        if start_node.height < 2: 
-            matched = compare(destination_list,start_list)
-            for city in matched:
-                reverse_path = get_path(city,stop_node)
-                matched_path.append((get_path(city,start_node),reverse_path[::-1]))
-            
-            if len(matched_path) != 0:
-                return clean_path(matched_path)
+    if stop in find_possible_destinations(start):
+        return [[start, stop]]
+
+    frontier_s = {start}
+    frontier_t = {stop}
+    parents_s = {start: []}
+    parents_t = {stop: []}
+    depth_s = depth_t = 0
+    while depth_s + depth_t < MAX_HOPS:
+        if len(frontier_s) <= len(frontier_t):
+            frontier_s = expand_frontier(frontier_s, parents_s, find_possible_destinations)
+            depth_s += 1
         else:
-            matched = compare_node(start_list,destination_list) 
+            frontier_t = expand_frontier(frontier_t, parents_t, find_possible_starts)
+            depth_t += 1
 
-        if start_node.height == 5 and start_node == 5: 
-            file.write('Unsupported request!\n')
-            file.close()
-            sys.exit(2)
-        elif len(matched) != 0:
+        matched = compare(frontier_s, frontier_t)
+        if len(matched) != 0:
+            matched_path = []
             for city in matched:
-                reverse_path = get_path_from_tree(city[1][0],city[1][1],stop_node)
-                matched_path.append((get_path_from_tree(city[0][0],city[0][1],start_node),reverse_path[::-1]))
+                for start_path in get_path(city, parents_s):
+                    for stop_path in get_path(city, parents_t):
+                        matched_path.append((start_path, stop_path[::-1]))
             return clean_path(matched_path)
+        elif len(frontier_s) == 0 or len(frontier_t) == 0:
+            break
+
+    output_lines.append('Unsupported request!\n')
+    sys.exit(2)
 
-        elif start_node.height == stop_node.height:
-            start_l = retrieve_leaves(start_node)
-            start_n = build_search_tree(start_node, start_l, find_possible_destinations)
-            return find_routes(start, stop, start_n.leaves,stop_node.leaves, start_n, stop_node, file_name)
-        else:
-            stop_l = retrieve_leaves(stop_node)
-            stop_n = build_search_tree(stop_node,stop_l, find_possible_starts)
-            return find_routes(start, stop, start_node.leaves, stop_n.leaves, start_node,stop_n, file_name)
-    
 
-def build_search_tree(node, possible_list, list_function):
-    """ Build the search tree of a route
+def expand_frontier(frontier, parents, list_function):
+    """ Expands a search frontier by one flight
 
     Parameters
     ----------
-    node: Node
-        the node/tree of the start/destination city
-    possible_list: list
-        the list of all possible cities to/from the a node
+    frontier: set
+        the cities reached in the last round of the search
+    parents: dict
+        the cities already visited mapped to the list of cities they were reached from,
+        updated with the newly reached cities
     list_function: function
-        the function that returns the list all the possible starts/destination to/from a node
+        the function that returns the list all the possible starts/destination to/from a city
 
     Returns
     -------
-    Node
-        the new built tree/node
+    set
+        the cities reached for the first time in this round
     """
-    tree = node
-    if tree.is_leaf:
-        for city in possible_list:
-            Node(city,parent=tree)
-    else:
-        for city in tree.leaves:
-            for location in list_function(city.name):
-                Node(location, parent=city)
-    return tree
+    next_frontier = {}
+    for city in frontier:
+        for location in list_function(city):
+            if location not in parents:
+                next_frontier.setdefault(location, []).append(city)
+    parents.update(next_frontier)
+    return set(next_frontier)
 
 
 def compare(start_lists, destination_lists):
@@ -278,125 +304,50 @@ def compare(start_lists, destination_lists):
 
     Parameters
     ----------
-    start_lists: list
-        list of all possible destinations from the start city
-    destination_lists:
-        list of all the possible starts to the destination city
-
-    Returns
-    -------
-    list
-        all the cities found in both lists 
-    """
-    possible_matches = []
-    for city in start_lists:
-        if city in destination_lists:
-            possible_matches.append(city)
-    return possible_matches
-
-
-def compare_node(start_lists, destination_lists):
-    """ Compare if any city node in the start lists is in the destinations lists
-
-    Parameters
-    ----------
-    start_lists: list
-        list of nodes of all possible destinations from the start city
-    destination_lists:
-        list of nodes of all the possible starts to the destination city
-
-    Returns
-    -------
-    list
-        all the city nodes found in both lists 
-
-    """
-    possible_matches = []
-    for city in start_lists:
-        for city2 in destination_lists:
-            if city2.name == city.name:
-                possible_matches.append(((city, city.parent),(city2, city2.parent)))
+    start_lists: set
+        set of all cities reached from the start city
+    destination_lists: set
+        set of all the cities reached from the destination city
 
-    return possible_matches
-
-
-def retrieve_leaves(node):
-
-    """ Retrieves list of the names of leaves the search tree
-    
-    Parameters
-    ----------
-    node: Node
-        the search tree/node
-    
     Returns
     -------
     list
-        the list of all the names of the leaves in the search tree/node
-    """
-
-    leaves_list = []
-    for city_node in node.leaves:
-        leaves_list.append(city_node.name)
-    
-    return leaves_list
-
-
-def get_path_from_tree(node, parent, tree):
-
-    """ Finds the path of a node
-    
-    Parameters
-    ----------
-    node: Node
-        the node to find the path
-    parent: Node
-        the parent of node
-    tree: tree
-        the tree of the node
-
-    Returns
-    -------
-    lists
-        a list of  path from the root to the node
+        all the cities found in both sets 
     """
-
-    for some_node in tree.leaves:
-        if some_node.name == node.name and some_node.path[:-1] == parent.path:
-            return some_node.path  
+    return list(start_lists & destination_lists)
 
 
-def get_path(node, tree):
+def get_path(node, parents):
 
-    """ Finds the path of a node
+    """ Finds all the shortest paths to a node
 
     Parameters
     ----------
     node: str 
-        the name of the node to find the path
-    tree: Node
-        the Node/tree of the node
+        the IATA code of the city to find the paths
+    parents: dict
+        the visited cities mapped to the list of cities they were reached from
 
     Returns
     -------
     list
-        a list of  path from the root to the node
+        a list of all the paths from the root to the node
     
     """
 
-    for some_node in tree.leaves:
-        if some_node.name == node:
-            return some_node.path  
+    if len(parents[node]) == 0:
+        return [[node]]
+    return [path + [node] for parent in parents[node] for path in get_path(parent, parents)]
 
 
 def clean_path(paths_list):
 
-    """ Returns lists of the path using the names
+    """ Joins the two halves of each path, dropping the city they share
 
     Parameters
     ----------
     paths_list: list
-        the list of the path using Nodes
+        the list of the (start path, stop path) halves of each path
 
     Returns
     -------
@@ -405,154 +356,126 @@ def clean_path(paths_list):
 
     """
 
-    cleaned_path = []
-    for route_paths in paths_list:
-        temp = []
-        for route_path in route_paths[0]:
-            if type(route_path) is str:
-                temp.append(route_path)
-            else:
-                temp.append(route_path.name)
-        if route_paths[1] is not None:
-            for route_path1 in route_paths[1]:
-                if type(route_path1) is str:
-                    if temp[len(temp)-1] != route_path1:
-                        temp.append(route_path1)
-                else:
-                    if temp[len(temp)-1] != route_path1.name:
-                        temp.append(route_path1.name)
-        cleaned_path.append(temp)
-    return cleaned_path 
-
-
-def write_routes(routes_lists,file_name):
-
-    """Writes the all the routes to the output file
+    return [start_path + stop_path[1:] for start_path, stop_path in paths_list]
+
+
+def write_routes(routes_lists, edge_details, output_lines):
+
+    """Adds all the routes to the output lines
 
     Parameters
     ----------
     routes_lists: list
         the list of all the possible paths for the route
-    file_name: str
-        the name of the file containing the route details
+    edge_details: dictionary
+        the airline and number of stops of each flight, from find_edge_details
+    output_lines: list
+        the lines written to the output file at the end of the program
 
     """
 
-    file = open("OutputFiles/" + file_name + "_output.txt", "a")
-    file.write("All Routes\n")
-    file.write("------------------------------\n\n")
+    output_lines.append("All Routes\n")
+    output_lines.append("------------------------------\n\n")
     for path in routes_lists:
-        file.write(f'Route from {path[0]} to path {path[len(path) - 1]}\n')
-        file.write("------------------------------\n")
+        output_lines.append(f'Route from {path[0]} to path {path[len(path) - 1]}\n')
+        output_lines.append("------------------------------\n")
         total_stops = 0
         for i in range(0, len(path)-1):
-            all_flight_details = find_flight_details(path[i],path[i+1])
-            airline,stop_number = randomize_airline_list(all_airlines(all_flight_details), all_flight_details)
-            file.write(f'{i+1}. {airline} from {path[i]} to {path[i+1]} {stop_number} stops\n')
+            airline,stop_number = edge_details[(path[i], path[i+1])]
+            output_lines.append(f'{i+1}. {airline} from {path[i]} to {path[i+1]} {stop_number} stops\n')
             total_stops += stop_number
-        file.write(f'Total flights: {len(path) -1}\n')
-        file.write(f'Total additional stops: {total_stops}\n\n\n')
-    file.close()
+        output_lines.append(f'Total flights: {len(path) -1}\n')
+        output_lines.append(f'Total additional stops: {total_stops}\n\n\n')
 
 
-def write_optimal_route(optimal_route, file_name):
+def find_edge_details(routes_lists):
 
-    """Writes the all the routes to the output file
+    """ Picks the airline and number of stops of every flight used by the routes
 
-    Parameters
-    ----------
-    optimal_route: list
-        the list of all the possible paths for the route
-    file_name: str
-        the name of the file containing the route details
-
-    """
-    
-    file = open("OutputFiles/" + file_name + "_output.txt", "a")
-    path = optimal_route[0]
-    file.write(f'Optimal route from {path[0]} to {path[len(path)-1]}\n')
-    file.write("------------------------------\n")
-    total_stops = 0
-    for i in range(0, len(path)-1):
-        all_flight_details = find_flight_details(path[i],path[i+1])
-        airline,stop_number = randomize_airline_list(all_airlines(all_flight_details), all_flight_details) 
-        file.write(f'{i+1}. {airline} from {path[i]} to {path[i+1]} {stop_number} stops\n')
-        total_stops += stop_number  
-    file.write(f'Total flights: {len(path) -1}\n')
-    file.write(f'Total additional stops: {total_stops}\n')
-    file.write(f'Total distance: {round(optimal_route[1], 2)} km\n')
-    file.write('Optimality criteria: flights and distance\n\n\n')
-    file.close()
-
-
-def calculate_distance(start_city,end_city):
-
-    """Calculate the the distance between two cities
+    Flights shared by several routes are only resolved once, so a flight is shown
+    with the same airline in every route it is part of.
 
     Parameters
     ----------
-    start_city: tuple
-        a tuple of the latitude and the longitude of the start city
-    end_city: tuple
-        a tuple of the latitude and the longitude of the stop/destination city
+    routes_lists: list
+        the list of all the possible paths for the route
 
     Returns
     -------
-    float
-        the distance between the two cities using the Haversine formula 
+    dictionary
+        a dictionary of the (start, stop) IATA codes of each flight to its airline and number of stops
 
     """
-    latitude1 = math.radians(float(start_city[0]))
-    latitude2 = math.radians(float(end_city[0]))
-    longitude1 = math.radians(float(start_city[1]))
-    longitude2 = math.radians(float(end_city[1]))
-    r = 6371
-    value1 = (math.sin((latitude2 - latitude1)/2))**2
-    value2 = math.cos(latitude1) * math.cos(latitude2) *(math.sin((longitude2 - longitude1)/2))**2
-    d = math.sqrt(value1 + value2)
-    return 2 * r * math.asin(d)
 
+    edges = {(path[i], path[i+1]) for path in routes_lists for i in range(0, len(path)-1)}
+    edge_details = {}
+    for start_code, end_code in edges:
+        edge_details[(start_code, end_code)] = randomize_airline_list(find_flight_details(start_code, end_code))
+    return edge_details
 
-def calculate_total_distance(path_list):
 
-    """ Calculate the total distance of a path
+def write_optimal_route(optimal_route, edge_details, output_lines):
+
+    """Adds the optimal route to the output lines
 
     Parameters
     ----------
-    path_list: list
-        the path of a route
+    optimal_route: list
+        the optimal path of the routes and its distance
+    edge_details: dictionary
+        the airline and number of stops of each flight, from find_edge_details
+    output_lines: list
+        the lines written to the output file at the end of the program
 
-    Returns
-    ------- 
-    float
-        the total distance of the path
     """
-    total_distance = 0
-    for i in range(0, len(path_list)-1):
-        total_distance += calculate_distance(path_list[i],path_list[i+1])
-    return total_distance
+    
+    path = optimal_route[0]
+    output_lines.append(f'Optimal route from {path[0]} to {path[len(path)-1]}\n')
+    output_lines.append("------------------------------\n")
+    total_stops = 0
+    for i in range(0, len(path)-1):
+        airline,stop_number = edge_details[(path[i], path[i+1])]
+        output_lines.append(f'{i+1}. {airline} from {path[i]} to {path[i+1]} {stop_number} stops\n')
+        total_stops += stop_number  
+    output_lines.append(f'Total flights: {len(path) -1}\n')
+    output_lines.append(f'Total additional stops: {total_stops}\n')
+    output_lines.append(f'Total distance: {round(optimal_route[1], 2)} km\n')
+    output_lines.append('Optimality criteria: flights and distance\n\n\n')
 
 
-def find_location(code):
+def haversine_totals(latitudes, longitudes, starts, ends):
 
-    """ Finds the latitude and longitude of a city
+    """ Calculate the total distance of several paths at once
 
-    Parameter
-    ---------
-    code: str
-        the IATA code of a city
+    The cities of all the paths are stored back to back, path k being the cities
+    from index starts[k] up to, but not including, ends[k]. Every path must have
+    at least two cities
+
+    Parameters
+    ----------
+    latitudes: ndarray
+        the latitude of every city of every path
+    longitudes: ndarray
+        the longitude of every city of every path
+    starts: ndarray
+        the index of the first city of each path
+    ends: ndarray
+        the index after the last city of each path
 
     Returns
     -------
-    tuple
-        a tuple of the latitude and longitude of the city
-
+    ndarray
+        the total distance of each path using the Haversine formula
     """
-    with open('CSVFiles/airports.csv') as airports_csv:
-        airports = csv.reader(airports_csv, delimiter=',')
-        for airport in airports:
-            if airport[4] == code:
-                return (airport[6], airport[7])
+    latitudes = np.radians(latitudes)
+    longitudes = np.radians(longitudes)
+    r = 6371
+    value1 = np.sin(np.diff(latitudes)/2)**2
+    value2 = np.cos(latitudes[:-1]) * np.cos(latitudes[1:]) * np.sin(np.diff(longitudes)/2)**2
+    segments = 2 * r * np.arcsin(np.sqrt(value1 + value2))
+    # segment ends[k] - 1 joins the last city of path k to the first city of path k + 1
+    segments[ends[:-1] - 1] = 0
+    return np.add.reduceat(segments, starts)
 
 
 def find_path_location(path_list):
@@ -562,27 +485,21 @@ def find_path_location(path_list):
     Parameter
     ---------
     path_list: list
-        a list of IATA code of a path
+        a list of the paths, each a list of IATA codes
 
     Returns
     -------
     list
-        a list of the latitude and longitude of the path
+        a list of the latitude and longitude of each city of each path,
+        None for a city not found in airports.csv
 
     """
-    path_code = []
-    temp = []
-    for path in path_list:
-        for city in path:
-            temp.append(find_location(city))
-        path_code.append(temp)
-        temp = []
-    return path_code
+    return [[AIRPORTS_BY_CODE.get(city) for city in path] for path in path_list]
 
 
 def find_flight_details(start_code, end_code):
 
-    """ Finds the airline id and stops of a path
+    """ Finds the airline code and stops of a path, only active airlines with a code are kept
 
     Parameter
     ---------
@@ -593,88 +510,34 @@ def find_flight_details(start_code, end_code):
     Returns
     -------
     list 
-        a list of the airline id and stops of the path
+        a list of the airline IATA code or ICAO code and stops of the path
     """
 
-    all_list = []
-    with open('CSVFiles/routes.csv') as routes_csv:
-        routes = csv.reader(routes_csv, delimiter=',')
-        for route in routes:
-            if route[2] == start_code and route[4] == end_code:
-                all_list.append((int(route[1]), int(route[7])))
-
-    return all_list   
+    return [(AIRLINES_BY_ID[airline_id], stops) for airline_id, stops in ROUTE_DETAILS.get((start_code, end_code), [])
+            if airline_id in AIRLINES_BY_ID]
 
 
-def all_airlines(flight_details):
-
-    """ Finds the airline id from the flight details
-
-    Parameter
-    ---------
-    flight_details: list
-        the list of the flight id and stops from a path
-
-    Returns
-    -------
-    list
-        a list of the IATA code and ICAO code of the path
-
-    """
-
-    airline_list = []
-    for detail in flight_details:
-        airline_list.append(find_airline(detail[0]))
-    return airline_list
-
-
-def find_airline(number):
-    """ Finds the IATA coe and ICAO code of the airline id
-
-    Parameter
-    ---------
-    number: int
-        the airline id of the route
-
-    Returns
-    -------
-    tuple
-        a tuple of the IATA code and ICAO code of the airline
-
-    """
-    with open('CSVFiles/airlines.csv') as airlines_csv:
-        airlines = csv.reader(airlines_csv, delimiter=',')
-        for airline in airlines:
-            if int(airline[0]) == number and airline[7] == "Y":
-                return (airline[3],airline[4])
-
-
-def randomize_airline_list(lists, flight_details):  
+def randomize_airline_list(flight_details):  
 
     """ Returns a random IATA code or ICAO code and the number of stops 
-        of an airline from the airline list 
+        of an airline from the flight details
 
     Parameter
     ---------
-    lists: list
-        the list of all the airlines 
     flight_details: list
-        the list of the airlines and the number of stops the route
+        the list of the airline codes and the number of stops the route
 
     Returns
     -------
     tuple
-        a tuple of the IATA code or ICAO code and the number stops
+        a tuple of the IATA code or ICAO code and the number stops,
+        ("UNKNOWN", 0) if the route has no airline
 
     """  
 
-    random = randint(0, len(lists)-1)
-    if len(lists[random][0]) != 0 and lists[random][0] != "\\N":
-        return lists[random][0],flight_details[random][1]
-    elif len(lists[random][1]) != 0 and lists[random][1] != "\\N":
-        return lists[random][1],flight_details[random][1]
-    else:
-        return randomize_airline_list(lists,flight_details)
+    if len(flight_details) == 0:
+        return "UNKNOWN", 0
+    return flight_details[randint(0, len(flight_details)-1)]
 
 
 def find_optimal_route(path_locations, path_lists):
@@ -690,53 +553,55 @@ def find_optimal_route(path_locations, path_lists):
     Returns
     -------
     list
-        the optimal path of the routes
+        the optimal path of the routes and its distance, paths with a city
+        without a known location are skipped. An empty list if no path is left
 
     """
 
-    optimal_route = []
-    
-    for i in range(0, len(path_locations)):
-        isLocation = True
-        for position in path_locations[i]:
-            if type(position) is not tuple:
-                isLocation = False
-
-        if isLocation:
-            distance = calculate_total_distance(path_locations[i])
-            if len(optimal_route) == 0:
-                optimal_route = [path_lists[i], distance]
-            elif optimal_route[1] > distance:
-                optimal_route = [path_lists[i],distance]
-            
-    return optimal_route
+    valid_paths = [i for i, locations in enumerate(path_locations) if None not in locations]
+    if len(valid_paths) == 0:
+        return []
+
+    coordinates = np.array([position for i in valid_paths for position in path_locations[i]], dtype=float)
+    ends = np.cumsum([len(path_locations[i]) for i in valid_paths])
+    starts = np.concatenate((np.zeros(1, dtype=ends.dtype), ends[:-1]))
+    distances = haversine_totals(coordinates[:, 0], coordinates[:, 1], starts, ends)
+    best = int(np.argmin(distances))
+    return [path_lists[valid_paths[best]], float(distances[best])]
 
 
 def main():
     """ Execute the program
     """
-    route_info = execute_argument()[0]
-    other_argument = execute_argument()[1]
+    route_info, other_argument = execute_argument()
+    _load_indices()
     file_name = route_info['filename']
-    start_code = find_location_code(route_info['start'][0],route_info['start'][1],file_name)
-    destination_code = find_location_code(route_info['destination'][0],route_info['destination'][1],file_name)
-    
-    all_possible_starts = find_possible_starts(destination_code)
-    all_possible_destinations = find_possible_destinations(start_code)
-    start_node = build_search_tree(Node(start_code), all_possible_destinations, find_possible_destinations)
-    destination_node = build_search_tree(Node(destination_code),all_possible_starts, find_possible_starts)
+    output_path = Path("OutputFiles") / f"{file_name}_output.txt"
+    output_lines = []
+    try:
+        start_code = find_location_code(route_info['start'][0],route_info['start'][1],output_lines)
+        destination_code = find_location_code(route_info['destination'][0],route_info['destination'][1],output_lines)
 
-    all_possible_routes = find_routes(start_code, destination_code, all_possible_destinations, all_possible_starts, start_node, destination_node, file_name)
-    
-    path_locations = find_path_location(all_possible_routes)
+        all_possible_routes = find_routes(start_code, destination_code, output_lines)
 
-    optimal_route = find_optimal_route(path_locations, all_possible_routes)
-    
-    if other_argument == "ALL":
-        write_routes(all_possible_routes, file_name)
-        write_optimal_route(optimal_route,file_name)
-    else:
-        write_optimal_route(optimal_route,file_name)
+        path_locations = find_path_location(all_possible_routes)
+
+        optimal_route = find_optimal_route(path_locations, all_possible_routes)
+        if len(optimal_route) == 0:
+            output_lines.append('Unsupported request!\n')
+            sys.exit(2)
+
+        if other_argument == "ALL":
+            edge_details = find_edge_details(all_possible_routes)
+            write_routes(all_possible_routes, edge_details, output_lines)
+            write_optimal_route(optimal_route, edge_details, output_lines)
+        else:
+            edge_details = find_edge_details([optimal_route[0]])
+            write_optimal_route(optimal_route, edge_details, output_lines)
+    finally:
+        # Also reached through sys.exit() so 'Unsupported request!' is written
+        with output_path.open("a") as output_file:
+            output_file.write("".join(output_lines))
 
 
 if __name__ == "__main__":